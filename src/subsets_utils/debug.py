@@ -3,7 +3,7 @@ import csv
 from datetime import datetime
 from pathlib import Path
 
-from .r2 import is_cloud_mode
+from .environment import get_config
 
 _log_dir = None
 _run_timestamp = None
@@ -12,7 +12,7 @@ _run_timestamp = None
 def _get_run_timestamp() -> str:
     global _run_timestamp
     if _run_timestamp is None:
-        run_id = os.environ.get('RUN_ID', '')
+        run_id = get_config().run_id
         # Extract timestamp from run_id (format: connector-YYYYMMDD-HHMMSS)
         parts = run_id.rsplit('-', 2)
         if len(parts) >= 2 and len(parts[-2]) == 8 and len(parts[-1]) == 6:
@@ -28,7 +28,7 @@ def _get_log_dir() -> Path:
         # Check for explicit LOG_DIR (set by runner.py)
         if os.environ.get('LOG_DIR'):
             _log_dir = Path(os.environ['LOG_DIR'])
-        elif is_cloud_mode():
+        elif get_config().cloud_mode:
             _log_dir = Path("/tmp/logs") / _get_run_timestamp()
         else:
             _log_dir = Path("logs") / _get_run_timestamp()
@@ -36,12 +36,13 @@ def _get_log_dir() -> Path:
     return _log_dir
 
 
-def _is_logging_enabled():
+def enabled() -> bool:
+    """Whether debug logging is on. Check before building expensive log payloads."""
     return os.environ.get('ENABLE_LOGGING', '').lower() == 'true'
 
 
 def _append_csv(filename: str, row: dict, fieldnames: list):
-    if not _is_logging_enabled():
+    if not enabled():
         return
     filepath = _get_log_dir() / filename
     file_exists = filepath.exists()
@@ -52,10 +53,10 @@ def _append_csv(filename: str, row: dict, fieldnames: list):
         writer.writerow(row)
 
 
-def log_http_request(method, url, status_code, duration_ms=None, error=None, **kwargs):
+def log_http_request(method, url, status_code, duration_ms=None, error=None, timestamp=None, **kwargs):
     _append_csv("http_requests.csv", {
-        "timestamp": datetime.now().isoformat(),
-        "run_id": os.environ.get('RUN_ID', 'unknown'),
+        "timestamp": timestamp or datetime.now().isoformat(),
+        "run_id": get_config().run_id,
         "method": method,
         "url": url,
         "status": status_code,
@@ -67,7 +68,7 @@ def log_http_request(method, url, status_code, duration_ms=None, error=None, **k
 def log_data_output(dataset_name, row_count, size_bytes, columns=None, null_counts=None, **kwargs):
     _append_csv("data_outputs.csv", {
         "timestamp": datetime.now().isoformat(),
-        "run_id": os.environ.get('RUN_ID', 'unknown'),
+        "run_id": get_config().run_id,
         "dataset": dataset_name,
         "rows": row_count,
         "size_bytes": size_bytes,
@@ -78,14 +79,14 @@ def log_data_output(dataset_name, row_count, size_bytes, columns=None, null_coun
 
 def log_run_start():
     # Detect environment (cloud vs local)
-    environment = "cloud" if is_cloud_mode() else "local"
+    environment = "cloud" if get_config().cloud_mode else "local"
 
     # Detect trigger (GitHub sets GITHUB_EVENT_NAME for Actions)
     trigger = os.environ.get('GITHUB_EVENT_NAME', 'manual')
 
     _append_csv("runs.csv", {
         "timestamp": datetime.now().isoformat(),
-        "run_id": os.environ.get('RUN_ID', 'unknown'),
+        "run_id": get_config().run_id,
         "event": "start",
         "status": "",
         "environment": environment,
@@ -96,14 +97,14 @@ def log_run_start():
 
 def log_run_end(status="completed", error=None):
     # Detect environment (cloud vs local)
-    environment = "cloud" if is_cloud_mode() else "local"
+    environment = "cloud" if get_config().cloud_mode else "local"
 
     # Detect trigger
     trigger = os.environ.get('GITHUB_EVENT_NAME', 'manual')
 
     _append_csv("runs.csv", {
         "timestamp": datetime.now().isoformat(),
-        "run_id": os.environ.get('RUN_ID', 'unknown'),
+        "run_id": get_config().run_id,
         "event": "end",
         "status": status,
         "environment": environment,
@@ -113,9 +114,9 @@ def log_run_end(status="completed", error=None):
 
 
 def log_state_change(asset, old_state, new_state):
-    if not _is_logging_enabled():
+    if not enabled():
         return
-    run_id = os.environ.get('RUN_ID', 'unknown')
+    run_id = get_config().run_id
     ts = datetime.now().isoformat()
     all_keys = set(old_state.keys()) | set(new_state.keys())
     for key in all_keys:
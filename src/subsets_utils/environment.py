@@ -1,4 +1,5 @@
 import os
+from dataclasses import dataclass
 
 
 def is_cloud_mode() -> bool:
@@ -12,24 +13,65 @@ def validate_environment():
     Local mode: requires DATA_DIR
     Cloud mode: requires R2 credentials
     """
-    if is_cloud_mode():
+    if get_config().cloud_mode:
         required = ["R2_ACCOUNT_ID", "R2_ACCESS_KEY_ID", "R2_SECRET_ACCESS_KEY", "R2_BUCKET_NAME"]
     else:
         required = ["DATA_DIR"]
 
     missing = [var for var in required if var not in os.environ]
     if missing:
-        mode = "cloud" if is_cloud_mode() else "local"
+        mode = "cloud" if get_config().cloud_mode else "local"
         raise ValueError(f"Missing required environment variables for {mode} mode: {missing}")
 
 
 def get_data_dir():
     """Get data directory. Only valid in local mode."""
-    if is_cloud_mode():
+    if get_config().cloud_mode:
         # In cloud mode, return a temp directory (data goes to R2, not disk)
         return "/tmp/data"
     return os.environ['DATA_DIR']
 
 
 def get_run_id():
-    return os.environ.get('RUN_ID', 'unknown')
\ No newline at end of file
+    return get_config().run_id
+
+
+@dataclass(frozen=True, slots=True)
+class IOConfig:
+    """Environment settings used on the I/O hot paths, resolved once per process."""
+    cloud_mode: bool
+    environment: str
+    connector_name: str
+    run_id: str
+
+    @classmethod
+    def from_env(cls) -> "IOConfig":
+        return cls(
+            cloud_mode=is_cloud_mode(),
+            environment=os.environ.get('ENVIRONMENT', 'dev'),
+            connector_name=os.environ.get('CONNECTOR_NAME', 'unknown'),
+            run_id=os.environ.get('RUN_ID', 'unknown'),
+        )
+
+
+_config = None
+
+
+def get_config() -> IOConfig:
+    """Get the cached IOConfig, reading the environment on first use."""
+    global _config
+    if _config is None:
+        _config = IOConfig.from_env()
+    return _config
+
+
+def reload_config() -> IOConfig:
+    """Re-read the environment, e.g. after changing os.environ in tests.
+
+    Mode checks, state/raw keys and Delta table URIs (io, r2, publish), debug's
+    run_id and the helpers above all go through get_config(), so call this
+    after changing CI, ENVIRONMENT, CONNECTOR_NAME or RUN_ID.
+    """
+    global _config
+    _config = IOConfig.from_env()
+    return _config
@@ -1,59 +1,118 @@
 import os
 import json
+import atexit
+import queue
 import hashlib
 import httpx
 import time
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from typing import Optional, Dict, Union
 from datetime import datetime
 from . import debug
 
+
+def _http2_available() -> bool:
+    """HTTP/2 needs the optional h2 package (httpx[http2])."""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
 _client = None
+_client_lock = threading.Lock()
 _client_config = {
     'timeout': int(os.environ.get('HTTP_TIMEOUT', '30')),
+    # Opt-in: bulk sequential downloads gain nothing from multiplexing and pay for h2's pure-Python framing
+    'http2': os.environ.get('HTTP_HTTP2', 'false').lower() == 'true',
+    'max_connections': int(os.environ.get('HTTP_MAX_CONNECTIONS', '100')),
+    'max_keepalive_connections': int(os.environ.get('HTTP_MAX_KEEPALIVE', '50')),
     'cache_enabled': os.environ.get('ENABLE_HTTP_CACHE', '').lower() == 'true',
     'cache_dir': Path(os.environ.get('HTTP_CACHE_DIR', 'http_cache')),
     'headers': {'User-Agent': os.environ.get('HTTP_USER_AGENT', 'DataIntegrations/1.0')}
 }
 
 class CacheManager:
-    def __init__(self, cache_dir: Path):
+    def __init__(self, cache_dir: Path, memory_size: int = None, memory_max_bytes: int = None):
         self.cache_dir = cache_dir
         self.cache_dir.mkdir(exist_ok=True, parents=True)
+        # In-process LRU of (status_code, headers, content) so repeat hits skip the filesystem.
+        # Bounded by entry count and by total body bytes, so large downloads (which are
+        # fetched once per run anyway) don't get pinned in memory.
+        self._mem = OrderedDict()
+        self._mem_cap = memory_size if memory_size is not None else int(os.environ.get('HTTP_MEMCACHE_SIZE', '256'))
+        self._mem_max_bytes = memory_max_bytes if memory_max_bytes is not None else int(os.environ.get('HTTP_MEMCACHE_MAX_BYTES', str(64 * 1024 * 1024)))
+        self._mem_bytes = 0
+        self._mem_lock = threading.Lock()
+
+    def _remember(self, key: str, entry: tuple):
+        size = len(entry[2])
+        if self._mem_cap <= 0 or size > self._mem_max_bytes:
+            return
+        with self._mem_lock:
+            self._forget(key)
+            self._mem[key] = entry
+            self._mem_bytes += size
+            while len(self._mem) > self._mem_cap or self._mem_bytes > self._mem_max_bytes:
+                _, evicted = self._mem.popitem(last=False)
+                self._mem_bytes -= len(evicted[2])
+
+    def _forget(self, key: str):
+        # Caller holds _mem_lock
+        entry = self._mem.pop(key, None)
+        if entry is not None:
+            self._mem_bytes -= len(entry[2])
         
     def _cache_key(self, method: str, url: str, params: Optional[Dict] = None) -> str:
-        key_parts = [method, url]
+        # Feed the parts to the hash one by one instead of joining them into a
+        # temporary string first; the digest is identical, so existing cache files stay valid
+        h = hashlib.md5(method.encode())
+        h.update(url.encode())
         if params:
-            key_parts.append(json.dumps(sorted(params.items())))
-        return hashlib.md5("".join(key_parts).encode()).hexdigest()
+            h.update(json.dumps(sorted(params.items())).encode())
+        return h.hexdigest()
     
     def get(self, method: str, url: str, **kwargs) -> Optional[httpx.Response]:
         key = self._cache_key(method, url, kwargs.get("params"))
-        metadata_file = self.cache_dir / f"{key}.meta.json"
-        content_file = self.cache_dir / f"{key}.bin"
-        
-        if metadata_file.exists() and content_file.exists():
+
+        with self._mem_lock:
+            entry = self._mem.get(key)
+            if entry is not None:
+                self._mem.move_to_end(key)
+
+        if entry is None:
+            metadata_file = self.cache_dir / f"{key}.meta.json"
+            content_file = self.cache_dir / f"{key}.bin"
+
+            if not (metadata_file.exists() and content_file.exists()):
+                return None
+
             # Load metadata
             with open(metadata_file, 'r') as f:
                 metadata = json.load(f)
-            
+
             # Load raw content bytes
             with open(content_file, 'rb') as f:
                 content = f.read()
-            
+
             # Get headers and remove encoding-related ones since content is raw
             headers = metadata.get("headers", {})
             headers.pop("content-encoding", None)
             headers.pop("transfer-encoding", None)
 
-            return httpx.Response(
-                status_code=metadata["status_code"],
-                headers=headers,
-                content=content,
-                request=httpx.Request(method, url)
-            )
-        
-        return None
+            entry = (metadata["status_code"], headers, content)
+            self._remember(key, entry)
+
+        status_code, headers, content = entry
+        return httpx.Response(
+            status_code=status_code,
+            headers=headers,
+            content=content,
+            request=httpx.Request(method, url)
+        )
     
     def save(self, method: str, url: str, response: httpx.Response, **kwargs):
         key = self._cache_key(method, url, kwargs.get("params"))
@@ -76,6 +135,10 @@ class CacheManager:
         with open(metadata_file, 'w') as f:
             json.dump(metadata, f, indent=2)
 
+        # Drop any stale in-memory copy; the next get() reloads the fresh one from disk
+        with self._mem_lock:
+            self._forget(key)
+
 
 class CachedClient:
     def __init__(self, client: httpx.Client, cache_manager: CacheManager):
@@ -110,10 +173,18 @@ class CachedClient:
     def close(self):
         self.client.close()
 
-def _create_base_client() -> httpx.Client:
+def _create_base_client(config: dict) -> httpx.Client:
+    # One pooled client is shared by every caller, so keep connections alive
+    # and reuse them instead of re-handshaking per request
     return httpx.Client(
-        timeout=_client_config['timeout'],
-        headers=_client_config['headers'],
+        http2=config['http2'],
+        timeout=config['timeout'],
+        headers=config['headers'],
+        limits=httpx.Limits(
+            max_connections=config['max_connections'],
+            max_keepalive_connections=config['max_keepalive_connections'],
+            keepalive_expiry=30,
+        ),
         follow_redirects=True
     )
 
@@ -121,22 +192,73 @@ def _get_or_create_client(**overrides) -> Union[httpx.Client, CachedClient]:
     global _client
     
     if _client is None:
-        config = _client_config.copy()
-        config.update(overrides)
-        
-        base_client = _create_base_client()
-        
-        if config['cache_enabled']:
-            cache_manager = CacheManager(config['cache_dir'])
-            _client = CachedClient(base_client, cache_manager)
-        else:
-            _client = base_client
+        with _client_lock:
+            if _client is None:
+                config = _client_config.copy()
+                config.update(overrides)
+                # Covers HTTP_HTTP2, configure_http() and get_client() overrides alike
+                if config['http2'] and not _http2_available():
+                    print("Warning: http2=True requires the h2 package (httpx[http2]); using HTTP/1.1")
+                    config['http2'] = False
+
+                base_client = _create_base_client(config)
+
+                if config['cache_enabled']:
+                    cache_manager = CacheManager(config['cache_dir'])
+                    _client = CachedClient(base_client, cache_manager)
+                else:
+                    _client = base_client
             
     return _client
 
+_log_queue = queue.SimpleQueue()
+_log_thread = None
+
+
+def _drain_log_queue():
+    """Write queued HTTP log records until the None sentinel arrives."""
+    while True:
+        record = _log_queue.get()
+        if record is None:
+            return
+        try:
+            debug.log_http_request(**record)
+        except Exception as e:
+            print(f"Warning: failed to log HTTP request: {e}")
+
+
+def _flush_log_queue():
+    global _log_thread
+    with _client_lock:
+        if _log_thread is not None:
+            _log_queue.put(None)
+            _log_thread.join(timeout=10)
+            # Records enqueued after this start a fresh writer instead of being lost
+            _log_thread = None
+
+
+atexit.register(_flush_log_queue)
+
+
+def _enqueue_http_log(**record):
+    """Hand an HTTP log record to the background writer so CSV I/O stays off the request path."""
+    global _log_thread
+
+    if _log_thread is None:
+        with _client_lock:
+            if _log_thread is None:
+                _log_thread = threading.Thread(target=_drain_log_queue, name="http-log-writer", daemon=True)
+                _log_thread.start()
+
+    _log_queue.put_nowait(record)
+
+
 def _logged_request(method: str, url: str, **kwargs) -> httpx.Response:
     """Execute HTTP request with logging if ENABLE_LOGGING is set."""
     client = _get_or_create_client()
+    if not debug.enabled():
+        return client.request(method, url, **kwargs)
+
     start = time.time()
     error = None
     status = None
@@ -150,7 +272,9 @@ def _logged_request(method: str, url: str, **kwargs) -> httpx.Response:
         raise
     finally:
         duration_ms = int((time.time() - start) * 1000)
-        debug.log_http_request(method, url, status, duration_ms=duration_ms, error=error)
+        # Stamp now; the background writer may get to this record much later
+        _enqueue_http_log(method=method, url=url, status_code=status, duration_ms=duration_ms, error=error,
+                          timestamp=datetime.now().isoformat())
 
 
 def get(url: str, **kwargs) -> httpx.Response:
@@ -173,7 +297,8 @@ def get_client(**overrides) -> Union[httpx.Client, CachedClient]:
 
 def configure_http(**config):
     global _client_config, _client
-    _client_config.update(config)
-    if _client:
-        _client.close()
-        _client = None
\ No newline at end of file
+    with _client_lock:
+        _client_config.update(config)
+        if _client:
+            _client.close()
+            _client = None
\ No newline at end of file
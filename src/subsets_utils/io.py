@@ -5,12 +5,35 @@ import gzip
 import uuid
 from datetime import datetime
 from pathlib import Path
+from typing import TYPE_CHECKING
 import pyarrow as pa
+import pyarrow.compute as pc
 import pyarrow.parquet as pq
-from deltalake import write_deltalake, DeltaTable
 from . import debug
-from .environment import get_data_dir
-from .r2 import is_cloud_mode, upload_bytes, upload_file, upload_fileobj, download_bytes, get_storage_options, get_delta_table_uri, get_bucket_name, get_connector_name
+from .environment import get_data_dir, get_config
+from .r2 import upload_bytes, upload_file, upload_fileobj, download_bytes, get_storage_options, get_delta_table_uri, get_bucket_name
+
+# deltalake is imported inside the functions that use it, so raw/state-only
+# callers (e.g. ingest) don't pay for loading it
+if TYPE_CHECKING:
+    from deltalake import DeltaTable, WriterProperties
+
+
+def _delta_writer_properties() -> "WriterProperties":
+    """Parquet settings for Delta writes.
+
+    zstd gives smaller files than the snappy default. Transform outputs are
+    sorted by date, so row groups smaller than the ~1M-row default keep
+    their min/max statistics tight enough for date filters to skip most
+    of the file on read.
+    """
+    from deltalake import WriterProperties
+
+    return WriterProperties(
+        compression="ZSTD",
+        compression_level=3,
+        max_row_group_size=256_000,
+    )
 
 
 def upload_data(data: pa.Table, dataset_name: str, metadata: dict = None, mode: str = "append", merge_key: str = None) -> str:
@@ -32,23 +55,30 @@ def upload_data(data: pa.Table, dataset_name: str, metadata: dict = None, mode:
     if mode == "merge" and not merge_key:
         raise ValueError("merge_key is required when mode='merge'")
 
+    from deltalake import write_deltalake, DeltaTable
+
     if mode == "overwrite":
         print(f"⚠️  Warning: Overwriting {dataset_name} - all existing data will be replaced")
 
-    if len(data) == 0:
+    num_rows = len(data)
+    if num_rows == 0:
         print(f"No data to upload for {dataset_name}")
         return ""
 
-    size_mb = round(data.nbytes / 1024 / 1024, 2)
-    columns = ', '.join([f.name for f in data.schema])
+    # Walk the schema and buffers once; the results are reused for the banner, merge updates and debug log
+    column_names = data.column_names
+    nbytes = data.nbytes
+
+    size_mb = round(nbytes / 1024 / 1024, 2)
     mode_label = {"append": "Appending to", "overwrite": "Overwriting", "merge": "Merging into"}[mode]
-    print(f"{mode_label} {dataset_name}: {len(data)} rows, {len(data.schema)} cols ({columns}), {size_mb} MB")
+    print(f"{mode_label} {dataset_name}: {num_rows} rows, {len(column_names)} cols ({', '.join(column_names)}), {size_mb} MB")
 
     # Extract metadata for Delta table
     table_name = metadata.get("title") if metadata else None
     table_description = json.dumps(metadata) if metadata else None
+    writer_properties = _delta_writer_properties()
 
-    if is_cloud_mode():
+    if get_config().cloud_mode:
         # Cloud mode: write directly to R2
         table_uri = get_delta_table_uri(dataset_name)
         storage_options = get_storage_options()
@@ -56,13 +86,14 @@ def upload_data(data: pa.Table, dataset_name: str, metadata: dict = None, mode:
         if mode == "merge":
             try:
                 dt = DeltaTable(table_uri, storage_options=storage_options)
-                updates = {col: f"source.{col}" for col in data.column_names}
+                updates = {col: f"source.{col}" for col in column_names}
                 (
                     dt.merge(
                         source=data,
                         predicate=f"target.{merge_key} = source.{merge_key}",
                         source_alias="source",
-                        target_alias="target"
+                        target_alias="target",
+                        writer_properties=writer_properties
                     )
                     .when_matched_update(updates=updates)
                     .when_not_matched_insert(updates=updates)
@@ -77,7 +108,8 @@ def upload_data(data: pa.Table, dataset_name: str, metadata: dict = None, mode:
                     data,
                     storage_options=storage_options,
                     name=table_name,
-                    description=table_description
+                    description=table_description,
+                    writer_properties=writer_properties
                 )
                 print(f"Created new table {dataset_name}")
         else:
@@ -88,7 +120,8 @@ def upload_data(data: pa.Table, dataset_name: str, metadata: dict = None, mode:
                 storage_options=storage_options,
                 name=table_name,
                 description=table_description,
-                schema_mode="merge" if mode == "append" else "overwrite"
+                schema_mode="merge" if mode == "append" else "overwrite",
+                writer_properties=writer_properties
             )
 
         output_path = table_uri
@@ -98,17 +131,18 @@ def upload_data(data: pa.Table, dataset_name: str, metadata: dict = None, mode:
 
         if mode == "merge":
             if not table_path.exists():
-                write_deltalake(str(table_path), data, name=table_name, description=table_description)
+                write_deltalake(str(table_path), data, name=table_name, description=table_description, writer_properties=writer_properties)
                 print(f"Created new table {dataset_name}")
             else:
                 dt = DeltaTable(str(table_path))
-                updates = {col: f"source.{col}" for col in data.column_names}
+                updates = {col: f"source.{col}" for col in column_names}
                 (
                     dt.merge(
                         source=data,
                         predicate=f"target.{merge_key} = source.{merge_key}",
                         source_alias="source",
-                        target_alias="target"
+                        target_alias="target",
+                        writer_properties=writer_properties
                     )
                     .when_matched_update(updates=updates)
                     .when_not_matched_insert(updates=updates)
@@ -123,51 +157,108 @@ def upload_data(data: pa.Table, dataset_name: str, metadata: dict = None, mode:
                 mode=mode,
                 name=table_name,
                 description=table_description,
-                schema_mode="merge" if mode == "append" else "overwrite"
+                schema_mode="merge" if mode == "append" else "overwrite",
+                writer_properties=writer_properties
             )
 
         output_path = str(table_path)
 
-    null_counts = {}
-    for col_name in data.column_names:
-        nulls = data[col_name].null_count
-        if nulls > 0:
-            null_counts[col_name] = nulls
-
-    debug.log_data_output(
-        dataset_name=dataset_name,
-        row_count=len(data),
-        size_bytes=data.nbytes,
-        columns=data.column_names,
-        column_count=len(data.schema),
-        null_counts=null_counts,
-        mode=mode
-    )
+    if debug.enabled():
+        null_counts = {}
+        for col_name, column in zip(column_names, data.columns):
+            nulls = column.null_count
+            if nulls > 0:
+                null_counts[col_name] = nulls
+
+        debug.log_data_output(
+            dataset_name=dataset_name,
+            row_count=num_rows,
+            size_bytes=nbytes,
+            columns=column_names,
+            column_count=len(column_names),
+            null_counts=null_counts,
+            mode=mode
+        )
 
     return output_path
 
 
+# Directories already created in this process, so repeated writes skip the mkdir syscalls
+_ensured_dirs = set()
+
+
+def _ensure_dir(path: Path):
+    if path not in _ensured_dirs:
+        path.mkdir(parents=True, exist_ok=True)
+        _ensured_dirs.add(path)
+
+
+# Serialized form of the state last read or written per asset in this process, so
+# save_state can skip rewriting unchanged state and doesn't have to re-read the old
+# state for debug logging
+_last_state = {}
+
+
+def _without_metadata(state: dict) -> dict:
+    return {k: v for k, v in state.items() if k != '_metadata'}
+
+
+def _state_fingerprint(state: dict) -> str:
+    # Loaded state carries _metadata, so it is left out on both sides. Serializing
+    # snapshots the state without a deepcopy and compares what would land in the file.
+    return json.dumps(_without_metadata(state))
+
+
+def _remember_state(asset: str, state: dict):
+    _last_state[asset] = _state_fingerprint(state)
+
+
+def _state_unchanged(asset: str, state_data: dict) -> bool:
+    last = _last_state.get(asset)
+    if last is None:
+        return False
+    return last == _state_fingerprint(state_data)
+
+
+def _encode_state(state_data: dict) -> bytes:
+    return json.dumps(state_data, indent=2).encode('utf-8')
+
+
+def _get_state_path(asset: str) -> Path:
+    """State file: .state/{environment}/{asset}.json (local mode only)"""
+    return Path(".state") / get_config().environment / f"{asset}.json"
+
+
+def _get_state_r2_key(asset: str) -> str:
+    """R2 key for state: {connector}/data/state/{asset}.json"""
+    connector = get_config().connector_name
+    return f"{connector}/data/state/{asset}.json"
+
+
 def load_state(asset: str) -> dict:
     """Load state for an asset.
 
     In local mode: reads from .state/{environment}/{asset}.json
     In cloud mode: reads from R2 {connector}/data/state/{asset}.json
     """
-    if is_cloud_mode():
-        connector = get_connector_name()
-        key = f"{connector}/data/state/{asset}.json"
-        data = download_bytes(key)
+    if get_config().cloud_mode:
+        data = download_bytes(_get_state_r2_key(asset))
         if data is None:
+            # Nothing persisted, so a cached copy must not make the next save a no-op
+            _last_state.pop(asset, None)
             return {}
-        return json.loads(data.decode('utf-8'))
+        state = json.loads(data.decode('utf-8'))
     else:
-        environment = os.environ.get('ENVIRONMENT', 'dev')
-        state_file = Path(".state") / environment / f"{asset}.json"
+        state_file = _get_state_path(asset)
 
-        if state_file.exists():
-            with open(state_file, 'r') as f:
-                return json.load(f)
-        return {}
+        if not state_file.exists():
+            _last_state.pop(asset, None)
+            return {}
+        with open(state_file, 'r') as f:
+            state = json.load(f)
+
+    _remember_state(asset, state)
+    return state
 
 
 def save_state(asset: str, state_data: dict) -> str:
@@ -175,35 +266,89 @@ def save_state(asset: str, state_data: dict) -> str:
 
     In local mode: writes to .state/{environment}/{asset}.json
     In cloud mode: writes to R2 {connector}/data/state/{asset}.json
+
+    Skips the write when state_data matches the state last loaded or saved
+    for this asset in the current process.
     """
-    # Load old state for comparison (for debug logging)
-    old_state = load_state(asset)
+    if _state_unchanged(asset, state_data):
+        if get_config().cloud_mode:
+            return f"s3://{get_bucket_name()}/{_get_state_r2_key(asset)}"
+        return str(_get_state_path(asset))
+
+    # Old state is only needed for the debug change log; prefer the copy we already hold
+    if not debug.enabled():
+        old_state = {}
+    elif asset in _last_state:
+        old_state = json.loads(_last_state[asset])
+    else:
+        old_state = load_state(asset)
 
     # Add metadata to state
     state_data = state_data.copy()
     state_data['_metadata'] = {
         'updated_at': datetime.now().isoformat(),
-        'run_id': os.environ.get('RUN_ID', 'unknown')
+        'run_id': get_config().run_id
     }
 
-    if is_cloud_mode():
-        connector = get_connector_name()
-        key = f"{connector}/data/state/{asset}.json"
-        data = json.dumps(state_data, indent=2).encode('utf-8')
-        uri = upload_bytes(data, key)
-        debug.log_state_change(asset, old_state, state_data)
-        return uri
+    if get_config().cloud_mode:
+        location = upload_bytes(_encode_state(state_data), _get_state_r2_key(asset))
     else:
-        environment = os.environ.get('ENVIRONMENT', 'dev')
-        state_dir = Path(".state") / environment
-        state_dir.mkdir(parents=True, exist_ok=True)
+        state_file = _get_state_path(asset)
+        _ensure_dir(state_file.parent)
+
+        # Write to a temp file and rename over the old one so a crash never leaves half-written state
+        tmp_file = state_file.with_name(f"{asset}.json.tmp")
+        tmp_file.write_bytes(_encode_state(state_data))
+        os.replace(tmp_file, state_file)
+        location = str(state_file)
 
-        state_file = state_dir / f"{asset}.json"
-        with open(state_file, 'w') as f:
-            json.dump(state_data, f, indent=2)
+    _remember_state(asset, state_data)
+    debug.log_state_change(asset, old_state, state_data)
+    return location
 
-        debug.log_state_change(asset, old_state, state_data)
-        return str(state_file)
+
+def _differs_from_delta(new_data: pa.Table, dt: "DeltaTable") -> bool:
+    """Compare new data against a Delta table, materializing it only as a last resort.
+
+    Row counts and column names are read from the Delta log, so the common
+    "row count changed" case never touches the parquet data files.
+    """
+    add_actions = pa.table(dt.get_add_actions(flatten=True))
+    num_records = add_actions.column("num_records")
+
+    # num_records is only missing when files were written without statistics
+    if num_records.null_count == 0:
+        existing_rows = pc.sum(num_records).as_py() or 0
+        if len(new_data) != existing_rows:
+            return True
+
+    if new_data.column_names != [field.name for field in dt.schema().fields]:
+        return True
+
+    existing_data = dt.to_pyarrow_table()
+
+    if len(new_data) != len(existing_data):
+        return True
+
+    if new_data.schema != existing_data.schema:
+        return True
+
+    # Compare in Arrow directly; no pandas conversion or CSV rendering of either table
+    return not _nan_as_null(new_data).equals(_nan_as_null(existing_data))
+
+
+def _nan_as_null(table: pa.Table) -> pa.Table:
+    """Replace NaN with null in float columns.
+
+    Arrow equality treats NaN != NaN, so identical tables holding NaN would
+    always look changed. The old CSV comparison rendered NaN and null as the
+    same empty cell; this keeps that behavior.
+    """
+    for i, field in enumerate(table.schema):
+        if pa.types.is_floating(field.type):
+            column = table.column(i)
+            table = table.set_column(i, field, pc.if_else(pc.is_nan(column), pa.scalar(None, field.type), column))
+    return table
 
 
 def has_changed(new_data: pa.Table, asset_name: str) -> bool:
@@ -219,25 +364,15 @@ def has_changed(new_data: pa.Table, asset_name: str) -> bool:
     Returns:
         bool: True if data has changed or doesn't exist, False if unchanged
     """
-    if is_cloud_mode():
+    from deltalake import DeltaTable
+
+    if get_config().cloud_mode:
         table_uri = get_delta_table_uri(asset_name)
         storage_options = get_storage_options()
 
         try:
             dt = DeltaTable(table_uri, storage_options=storage_options)
-            existing_data = dt.to_pyarrow_table()
-
-            if len(new_data) != len(existing_data):
-                return True
-
-            if new_data.schema != existing_data.schema:
-                return True
-
-            new_bytes = new_data.to_pandas().to_csv(index=False)
-            existing_bytes = existing_data.to_pandas().to_csv(index=False)
-
-            return new_bytes != existing_bytes
-
+            return _differs_from_delta(new_data, dt)
         except Exception:
             return True
     else:
@@ -248,24 +383,12 @@ def has_changed(new_data: pa.Table, asset_name: str) -> bool:
 
         try:
             dt = DeltaTable(str(table_path))
-            existing_data = dt.to_pyarrow_table()
-
-            if len(new_data) != len(existing_data):
-                return True
-
-            if new_data.schema != existing_data.schema:
-                return True
-
-            new_bytes = new_data.to_pandas().to_csv(index=False)
-            existing_bytes = existing_data.to_pandas().to_csv(index=False)
-
-            return new_bytes != existing_bytes
-
+            return _differs_from_delta(new_data, dt)
         except Exception:
             return True
 
 
-def load_asset(asset_name: str) -> pa.Table:
+def load_asset(asset_name: str, columns: list[str] | None = None, filters: list | pc.Expression | None = None) -> pa.Table:
     """Load a previously saved asset from Delta table.
 
     In local mode: reads from DATA_DIR/subsets/{asset_name}
@@ -273,6 +396,11 @@ def load_asset(asset_name: str) -> pa.Table:
 
     Args:
         asset_name: The dataset/asset name (e.g., 'indicators', 'series')
+        columns: Optional subset of columns to read
+        filters: Optional DNF filters, e.g. [("date", ">=", "2020-01-01")], or a
+            pyarrow.compute expression such as pc.field("date") >= "2020-01-01".
+            Either way the read goes through a pyarrow.dataset scanner, so files
+            and row groups whose statistics rule them out are skipped.
 
     Returns:
         pa.Table: The loaded PyArrow table
@@ -280,15 +408,19 @@ def load_asset(asset_name: str) -> pa.Table:
     Raises:
         FileNotFoundError: If no Delta table found
     """
-    if is_cloud_mode():
+    from deltalake import DeltaTable
+
+    if get_config().cloud_mode:
         table_uri = get_delta_table_uri(asset_name)
         storage_options = get_storage_options()
 
         try:
             dt = DeltaTable(table_uri, storage_options=storage_options)
-            return dt.to_pyarrow_table()
         except Exception as e:
             raise FileNotFoundError(f"No Delta table found at {table_uri}") from e
+
+        # Outside the try so bad columns/filters surface as themselves, not as a missing table
+        return dt.to_pyarrow_table(columns=columns, filters=filters)
     else:
         table_path = Path(get_data_dir()) / "subsets" / asset_name
 
@@ -296,19 +428,34 @@ def load_asset(asset_name: str) -> pa.Table:
             raise FileNotFoundError(f"No Delta table found at {table_path}")
 
         dt = DeltaTable(str(table_path))
-        return dt.to_pyarrow_table()
+        return dt.to_pyarrow_table(columns=columns, filters=filters)
+
+
+# zstd gives noticeably smaller raw files than snappy at similar write speed
+_RAW_PARQUET_OPTIONS = {
+    'compression': 'zstd',
+    'compression_level': 3,
+    'use_dictionary': True,
+    'write_statistics': True,
+    'data_page_size': 1024 * 1024,
+}
 
 
-def _get_raw_path(asset_id: str, extension: str) -> Path:
-    """Raw directory: DATA_DIR/raw/asset_id.ext (local mode only)"""
+def _get_raw_path(asset_id: str, extension: str, ensure: bool = True) -> Path:
+    """Raw directory: DATA_DIR/raw/asset_id.ext (local mode only)
+
+    With ensure=True the parent directory is created (once per process);
+    loaders pass ensure=False since they never write.
+    """
     path = Path(get_data_dir()) / "raw" / f"{asset_id}.{extension}"
-    path.parent.mkdir(parents=True, exist_ok=True)
+    if ensure:
+        _ensure_dir(path.parent)
     return path
 
 
 def _get_raw_r2_key(asset_id: str, extension: str) -> str:
     """R2 key for raw data: {connector}/data/raw/asset_id.ext"""
-    connector = get_connector_name()
+    connector = get_config().connector_name
     return f"{connector}/data/raw/{asset_id}.{extension}"
 
 
@@ -323,7 +470,7 @@ def save_raw_file(content: str | bytes, asset_id: str, extension: str = "txt") -
         asset_id: The identifier for the asset
         extension: File extension (e.g., 'csv', 'xml', 'zip')
     """
-    if is_cloud_mode():
+    if get_config().cloud_mode:
         key = _get_raw_r2_key(asset_id, extension)
         if isinstance(content, str):
             data = content.encode('utf-8')
@@ -352,7 +499,7 @@ def load_raw_file(asset_id: str, extension: str = "txt") -> str | bytes:
     In local mode: reads from DATA_DIR/raw/{asset_id}.{extension}
     In cloud mode: downloads from R2
     """
-    if is_cloud_mode():
+    if get_config().cloud_mode:
         key = _get_raw_r2_key(asset_id, extension)
         data = download_bytes(key)
         if data is None:
@@ -363,17 +510,18 @@ def load_raw_file(asset_id: str, extension: str = "txt") -> str | bytes:
         except UnicodeDecodeError:
             return data
     else:
-        path = _get_raw_path(asset_id, extension)
+        path = _get_raw_path(asset_id, extension, ensure=False)
 
-        if not path.exists():
-            raise FileNotFoundError(f"Raw asset '{asset_id}.{extension}' not found.")
+        # Read once as bytes and decode in memory, same as the R2 branch
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Raw asset '{asset_id}.{extension}' not found.") from None
 
         try:
-            with open(path, 'r', encoding='utf-8') as f:
-                return f.read()
+            return data.decode('utf-8')
         except UnicodeDecodeError:
-            with open(path, 'rb') as f:
-                return f.read()
+            return data
 
 
 def save_raw_json(data: any, asset_id: str, compress: bool = False) -> str:
@@ -386,7 +534,7 @@ def save_raw_json(data: any, asset_id: str, compress: bool = False) -> str:
     """
     ext = "json.gz" if compress else "json"
 
-    if is_cloud_mode():
+    if get_config().cloud_mode:
         key = _get_raw_r2_key(asset_id, ext)
         if compress:
             buffer = io.BytesIO()
@@ -420,7 +568,7 @@ def load_raw_json(asset_id: str) -> any:
     In local mode: reads from DATA_DIR/raw/{asset_id}.json[.gz]
     In cloud mode: downloads from R2
     """
-    if is_cloud_mode():
+    if get_config().cloud_mode:
         # Try uncompressed first
         key = _get_raw_r2_key(asset_id, "json")
         data = download_bytes(key)
@@ -438,13 +586,13 @@ def load_raw_json(asset_id: str) -> any:
         raise FileNotFoundError(f"Raw asset '{asset_id}' not found in R2.")
     else:
         # Try uncompressed first
-        path = _get_raw_path(asset_id, "json")
+        path = _get_raw_path(asset_id, "json", ensure=False)
         if path.exists():
             with open(path, 'r', encoding='utf-8') as f:
                 return json.load(f)
 
         # Try compressed
-        path = _get_raw_path(asset_id, "json.gz")
+        path = _get_raw_path(asset_id, "json.gz", ensure=False)
         if path.exists():
             with gzip.open(path, 'rt', encoding='utf-8') as f:
                 return json.load(f)
@@ -473,11 +621,11 @@ def save_raw_parquet(data: pa.Table, asset_id: str, metadata: dict = None) -> st
         existing_metadata[b'asset_metadata'] = json.dumps(metadata).encode('utf-8')
         data = data.replace_schema_metadata(existing_metadata)
 
-    if is_cloud_mode():
+    if get_config().cloud_mode:
         # Temp & Toss pattern: write to temp, upload, delete
         temp_path = f"/tmp/{uuid.uuid4()}.parquet"
         try:
-            pq.write_table(data, temp_path, compression='snappy')
+            pq.write_table(data, temp_path, **_RAW_PARQUET_OPTIONS)
             key = _get_raw_r2_key(asset_id, "parquet")
             uri = upload_file(temp_path, key)
             print(f"  -> R2: Saved {asset_id}.parquet ({data.num_rows:,} rows)")
@@ -488,12 +636,12 @@ def save_raw_parquet(data: pa.Table, asset_id: str, metadata: dict = None) -> st
                 os.remove(temp_path)
     else:
         path = _get_raw_path(asset_id, "parquet")
-        pq.write_table(data, path, compression='snappy')
+        pq.write_table(data, path, **_RAW_PARQUET_OPTIONS)
         print(f"  -> Raw Cache: Saved {asset_id}.parquet ({data.num_rows:,} rows)")
         return str(path)
 
 
-def load_raw_parquet(asset_id: str) -> pa.Table:
+def load_raw_parquet(asset_id: str, columns: list[str] | None = None, filters: list | pc.Expression | None = None) -> pa.Table:
     """Load raw Parquet file as PyArrow table.
 
     In local mode: reads from DATA_DIR/raw/{asset_id}.parquet
@@ -501,11 +649,13 @@ def load_raw_parquet(asset_id: str) -> pa.Table:
 
     Args:
         asset_id: Identifier for the asset
+        columns: Optional subset of columns to read
+        filters: Optional DNF filters or pyarrow.compute expression passed to pq.read_table
 
     Returns:
         PyArrow table
     """
-    if is_cloud_mode():
+    if get_config().cloud_mode:
         key = _get_raw_r2_key(asset_id, "parquet")
         data = download_bytes(key)
         if data is None:
@@ -513,12 +663,12 @@ def load_raw_parquet(asset_id: str) -> pa.Table:
 
         # Read parquet from bytes
         buffer = io.BytesIO(data)
-        return pq.read_table(buffer)
+        return pq.read_table(buffer, columns=columns, filters=filters)
     else:
-        path = _get_raw_path(asset_id, "parquet")
+        path = _get_raw_path(asset_id, "parquet", ensure=False)
         if not path.exists():
             raise FileNotFoundError(f"Raw parquet asset '{asset_id}' not found at {path}")
 
-        return pq.read_table(path)
+        return pq.read_table(path, columns=columns, filters=filters)
 
 
@@ -1,7 +1,6 @@
 import json
 from pathlib import Path
-from deltalake import DeltaTable
-from .environment import get_data_dir, is_cloud_mode
+from .environment import get_data_dir, get_config
 from .r2 import get_delta_table_uri, get_storage_options
 
 def publish(dataset_name: str, metadata: dict):
@@ -10,7 +9,9 @@ def publish(dataset_name: str, metadata: dict):
     if 'title' not in metadata:
         raise ValueError("Missing required field: 'title'")
 
-    if is_cloud_mode():
+    from deltalake import DeltaTable
+
+    if get_config().cloud_mode:
         table_uri = get_delta_table_uri(dataset_name)
         dt = DeltaTable(table_uri, storage_options=get_storage_options())
     else:
@@ -18,8 +19,7 @@ def publish(dataset_name: str, metadata: dict):
         dt = DeltaTable(str(table_path))
 
     if 'column_descriptions' in metadata:
-        schema = dt.schema().to_pyarrow() if hasattr(dt.schema(), 'to_pyarrow') else dt.schema().to_arrow()
-        actual_columns = {field.name for field in schema}
+        actual_columns = {field.name for field in dt.schema().fields}
         col_descs = json.loads(metadata['column_descriptions']) if isinstance(
             metadata['column_descriptions'], str
         ) else metadata['column_descriptions']
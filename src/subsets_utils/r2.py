@@ -8,6 +8,8 @@ import os
 import io
 from typing import Optional
 
+from .environment import get_config
+
 _s3_client = None
 
 
@@ -17,8 +19,8 @@ def is_cloud_mode() -> bool:
 
 
 def get_connector_name() -> str:
-    """Get the connector name from environment (set by runner.py)."""
-    return os.environ.get('CONNECTOR_NAME', 'unknown')
+    """Get the connector name (CONNECTOR_NAME, set by runner.py) from the cached config."""
+    return get_config().connector_name
 
 
 def _get_r2_config() -> dict:
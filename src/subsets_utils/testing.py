@@ -29,6 +29,7 @@ Usage in asset test.py:
 
 import re
 import pyarrow as pa
+import pyarrow.compute as pc
 
 
 # =============================================================================
@@ -136,26 +137,27 @@ def assert_in_set(table: pa.Table, column: str, valid_values: set) -> None:
 
 def assert_positive(table: pa.Table, column: str, allow_zero: bool = True) -> None:
     """Assert all non-null numeric values are positive (or zero if allow_zero=True)."""
-    values = [v for v in table.column(column).to_pylist() if v is not None]
+    col = table.column(column)
     if allow_zero:
-        invalid = [v for v in values if v < 0]
-        assert not invalid, f"Column '{column}' has negative values: {invalid[:5]}..."
+        invalid = col.filter(pc.less(col, 0))
+        assert len(invalid) == 0, f"Column '{column}' has negative values: {invalid.slice(0, 5).to_pylist()}..."
     else:
-        invalid = [v for v in values if v <= 0]
-        assert not invalid, f"Column '{column}' has non-positive values: {invalid[:5]}..."
+        invalid = col.filter(pc.less_equal(col, 0))
+        assert len(invalid) == 0, f"Column '{column}' has non-positive values: {invalid.slice(0, 5).to_pylist()}..."
 
 
 def assert_in_range(table: pa.Table, column: str, min_val: float = None, max_val: float = None) -> None:
     """Assert all non-null numeric values are within the specified range."""
-    values = [v for v in table.column(column).to_pylist() if v is not None]
-    invalid = []
-    for v in values:
-        if min_val is not None and v < min_val:
-            invalid.append(v)
-        elif max_val is not None and v > max_val:
-            invalid.append(v)
+    col = table.column(column)
+    out_of_range = None
+    if min_val is not None:
+        out_of_range = pc.less(col, min_val)
+    if max_val is not None:
+        above = pc.greater(col, max_val)
+        out_of_range = above if out_of_range is None else pc.or_(out_of_range, above)
+    invalid = col.filter(out_of_range).slice(0, 5).to_pylist() if out_of_range is not None else []
     range_desc = f"[{min_val}, {max_val}]"
-    assert not invalid, f"Column '{column}' has values outside range {range_desc}: {invalid[:5]}..."
+    assert not invalid, f"Column '{column}' has values outside range {range_desc}: {invalid}..."
 
 
 def assert_percentage(table: pa.Table, column: str) -> None:
@@ -189,21 +191,23 @@ def validate(table: pa.Table, schema: dict) -> None:
     if max_rows := schema.get("max_rows"):
         assert len(table) <= max_rows, f"Expected <= {max_rows} rows, got {len(table)}"
 
+    # Resolve column names to positions once; table.column(name) scans the schema each call
+    col_idx = {name: i for i, name in enumerate(table.column_names)}
+
     # Check columns exist and have correct types
     if columns := schema.get("columns"):
-        table_columns = set(table.column_names)
-
         for col, expected_type in columns.items():
-            assert col in table_columns, f"Missing column: {col}"
-            actual_type = str(table.schema.field(col).type)
+            assert col in col_idx, f"Missing column: {col}"
+            actual_type = str(table.schema.types[col_idx[col]])
             assert expected_type in actual_type, (
                 f"Column '{col}': expected type containing '{expected_type}', got '{actual_type}'"
             )
 
     # Check not-null columns
     if not_null := schema.get("not_null"):
+        table_columns = table.columns
         for col in not_null:
-            null_count = table.column(col).null_count
+            null_count = table_columns[col_idx[col]].null_count
             assert null_count == 0, f"Column '{col}' has {null_count} null values"
 
     # Check unique constraint (composite key support)
@@ -212,12 +216,12 @@ def validate(table: pa.Table, schema: dict) -> None:
             unique = [unique]
 
         if len(unique) == 1:
-            values = table.column(unique[0]).to_pylist()
-            duplicates = len(values) - len(set(values))
+            # mode="all" counts null as one value, matching set() semantics
+            distinct = pc.count_distinct(table.column(unique[0]), mode="all").as_py()
+            duplicates = len(table) - distinct
             assert duplicates == 0, f"Column '{unique[0]}' has {duplicates} duplicate values"
         else:
-            # Composite key - convert columns once, then zip
-            columns_as_lists = [table.column(col).to_pylist() for col in unique]
-            rows = list(zip(*columns_as_lists))
-            duplicates = len(rows) - len(set(rows))
+            # Composite key - count distinct combinations with an Arrow hash group-by
+            distinct = len(table.select(unique).group_by(unique).aggregate([]))
+            duplicates = len(table) - distinct
             assert duplicates == 0, f"Columns {unique} have {duplicates} duplicate combinations"
@@ -1,6 +1,7 @@
 """Validation for Zillow Home Value Index datasets."""
 
 import pyarrow as pa
+import pyarrow.compute as pc
 from subsets_utils import validate
 from subsets_utils.testing import assert_valid_date, assert_positive
 
@@ -48,14 +49,14 @@ def test(table: pa.Table, region_type: str) -> None:
     # Check value ranges for present columns
     for col in value_columns:
         if col in table.column_names:
-            values = [v for v in table.column(col).to_pylist() if v is not None]
-            if values:
-                assert min(values) >= 0, f"{col} has negative values: min={min(values)}"
-                assert max(values) <= 50_000_000, f"{col} values seem too high: max={max(values)}"
+            stats = pc.min_max(table.column(col)).as_py()
+            if stats["min"] is not None:
+                assert stats["min"] >= 0, f"{col} has negative values: min={stats['min']}"
+                assert stats["max"] <= 50_000_000, f"{col} values seem too high: max={stats['max']}"
 
     # Check date range
-    dates = table.column("date").to_pylist()
-    min_year = int(min(dates)[:4])
-    max_year = int(max(dates)[:4])
+    date_range = pc.min_max(table.column("date")).as_py()
+    min_year = int(date_range["min"][:4])
+    max_year = int(date_range["max"][:4])
     assert min_year >= 1990, f"Data goes back too far: {min_year}"
     assert max_year <= 2030, f"Data goes into the future: {max_year}"
@@ -1,6 +1,7 @@
 """Validation for Zillow Sales datasets."""
 
 import pyarrow as pa
+import pyarrow.compute as pc
 from subsets_utils import validate
 from subsets_utils.testing import assert_valid_date, assert_positive
 
@@ -48,35 +49,35 @@ def test(table: pa.Table, region_type: str) -> None:
     # Check price ranges
     for col in ["median_list_price", "median_sale_price"]:
         if col in table.column_names:
-            values = [v for v in table.column(col).to_pylist() if v is not None]
-            if values:
-                assert min(values) >= 0, f"{col} has negative values: min={min(values)}"
-                assert max(values) <= 100_000_000, f"{col} values seem too high: max={max(values)}"
+            stats = pc.min_max(table.column(col)).as_py()
+            if stats["min"] is not None:
+                assert stats["min"] >= 0, f"{col} has negative values: min={stats['min']}"
+                assert stats["max"] <= 100_000_000, f"{col} values seem too high: max={stats['max']}"
 
     # Check percentage ranges
     for col in ["pct_sold_above_list", "pct_sold_below_list", "pct_price_cut"]:
         if col in table.column_names:
-            values = [v for v in table.column(col).to_pylist() if v is not None]
-            if values:
-                assert min(values) >= 0, f"{col} has negative values: min={min(values)}"
-                assert max(values) <= 100, f"{col} values exceed 100%: max={max(values)}"
+            stats = pc.min_max(table.column(col)).as_py()
+            if stats["min"] is not None:
+                assert stats["min"] >= 0, f"{col} has negative values: min={stats['min']}"
+                assert stats["max"] <= 100, f"{col} values exceed 100%: max={stats['max']}"
 
     # Check days range
     if "days_to_pending" in table.column_names:
-        values = [v for v in table.column("days_to_pending").to_pylist() if v is not None]
-        if values:
-            assert min(values) >= 0, f"days_to_pending has negative values: min={min(values)}"
-            assert max(values) <= 365, f"days_to_pending seems too high: max={max(values)}"
+        stats = pc.min_max(table.column("days_to_pending")).as_py()
+        if stats["min"] is not None:
+            assert stats["min"] >= 0, f"days_to_pending has negative values: min={stats['min']}"
+            assert stats["max"] <= 365, f"days_to_pending seems too high: max={stats['max']}"
 
     # Check sales_count
     if "sales_count" in table.column_names:
-        values = [v for v in table.column("sales_count").to_pylist() if v is not None]
-        if values:
-            assert min(values) >= 0, f"sales_count has negative values: min={min(values)}"
+        stats = pc.min_max(table.column("sales_count")).as_py()
+        if stats["min"] is not None:
+            assert stats["min"] >= 0, f"sales_count has negative values: min={stats['min']}"
 
     # Check date range
-    dates = table.column("date").to_pylist()
-    min_year = int(min(dates)[:4])
-    max_year = int(max(dates)[:4])
+    date_range = pc.min_max(table.column("date")).as_py()
+    min_year = int(date_range["min"][:4])
+    max_year = int(date_range["max"][:4])
     assert min_year >= 2010, f"Sales data shouldn't go back before 2010: {min_year}"
     assert max_year <= 2030, f"Data goes into the future: {max_year}"
@@ -1,12 +1,11 @@
 import os
-import io
 import json
 import gzip
+import uuid
 from datetime import datetime
 from pathlib import Path
 import pyarrow as pa
 import pyarrow.parquet as pq
-from deltalake import write_deltalake, DeltaTable
 from . import debug
 from .environment import get_data_dir
 
@@ -18,6 +17,8 @@ def upload_data(data: pa.Table, dataset_name: str, mode: str = "append", merge_k
     if mode == "merge" and not merge_key:
         raise ValueError("merge_key is required when mode='merge'")
 
+    from deltalake import write_deltalake, DeltaTable
+
     if mode == "overwrite":
         print(f"⚠️  Warning: Overwriting {dataset_name} - all existing data will be replaced")
 
@@ -138,6 +139,8 @@ def has_changed(new_data: pa.Table, asset_name: str) -> bool:
     Returns:
         bool: True if data has changed or doesn't exist, False if unchanged
     """
+    from deltalake import DeltaTable
+
     table_path = Path(get_data_dir()) / "subsets" / asset_name
 
     if not table_path.exists():
@@ -181,6 +184,8 @@ def load_asset(asset_name: str) -> pa.Table:
     Raises:
         FileNotFoundError: If no Delta table found
     """
+    from deltalake import DeltaTable
+
     table_path = Path(get_data_dir()) / "subsets" / asset_name
 
     if not table_path.exists():
@@ -289,6 +294,7 @@ def upload_raw_to_r2(data: pa.Table, key: str) -> str:
         str: The S3 URI of the uploaded file
     """
     import boto3
+    from boto3.s3.transfer import TransferConfig
 
     if len(data) == 0:
         print(f"No data to upload for {key}")
@@ -309,13 +315,25 @@ def upload_raw_to_r2(data: pa.Table, key: str) -> str:
         region_name='auto'
     )
 
-    buffer = io.BytesIO()
-    pq.write_table(data, buffer, compression='snappy')
-    buffer.seek(0)
+    # Encode to a temp file instead of an in-memory buffer so large tables don't
+    # hold a second full copy in RAM; upload_file then streams it as a threaded multipart upload
+    transfer_config = TransferConfig(
+        multipart_threshold=16 * 1024 * 1024,
+        multipart_chunksize=16 * 1024 * 1024,
+        max_concurrency=8,
+        use_threads=True
+    )
+
+    temp_path = f"/tmp/{uuid.uuid4()}.parquet"
+    try:
+        pq.write_table(data, temp_path, compression='zstd', compression_level=3, use_dictionary=True, write_statistics=True, data_page_size=1024 * 1024)
 
-    size_mb = round(buffer.getbuffer().nbytes / 1024 / 1024, 2)
-    print(f"Uploading to R2: {key} ({len(data)} rows, {size_mb} MB)")
+        size_mb = round(os.path.getsize(temp_path) / 1024 / 1024, 2)
+        print(f"Uploading to R2: {key} ({len(data)} rows, {size_mb} MB)")
 
-    s3_client.upload_fileobj(buffer, bucket_name, key)
+        s3_client.upload_file(temp_path, bucket_name, key, Config=transfer_config)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
 
     return f"s3://{bucket_name}/{key}"
\ No newline at end of file
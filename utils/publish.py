@@ -1,6 +1,5 @@
 import json
 from pathlib import Path
-from deltalake import DeltaTable
 from .environment import get_data_dir
 
 def publish(dataset_name: str, metadata: dict):
@@ -9,12 +8,13 @@ def publish(dataset_name: str, metadata: dict):
     if 'title' not in metadata:
         raise ValueError("Missing required field: 'title'")
 
+    from deltalake import DeltaTable
+
     table_path = Path(get_data_dir()) / dataset_name
     dt = DeltaTable(str(table_path))
 
     if 'column_descriptions' in metadata:
-        schema = dt.schema().to_pyarrow() if hasattr(dt.schema(), 'to_pyarrow') else dt.schema().to_arrow()
-        actual_columns = {field.name for field in schema}
+        actual_columns = {field.name for field in dt.schema().fields}
         col_descs = json.loads(metadata['column_descriptions']) if isinstance(
             metadata['column_descriptions'], str
         ) else metadata['column_descriptions']
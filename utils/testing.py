@@ -21,6 +21,7 @@ Usage in asset test.py:
 """
 
 import pyarrow as pa
+import pyarrow.compute as pc
 
 
 def validate(table: pa.Table, schema: dict) -> None:
@@ -45,21 +46,23 @@ def validate(table: pa.Table, schema: dict) -> None:
     if max_rows := schema.get("max_rows"):
         assert len(table) <= max_rows, f"Expected <= {max_rows} rows, got {len(table)}"
 
+    # Resolve column names to positions once; table.column(name) scans the schema each call
+    col_idx = {name: i for i, name in enumerate(table.column_names)}
+
     # Check columns exist and have correct types
     if columns := schema.get("columns"):
-        table_columns = set(table.column_names)
-
         for col, expected_type in columns.items():
-            assert col in table_columns, f"Missing column: {col}"
-            actual_type = str(table.schema.field(col).type)
+            assert col in col_idx, f"Missing column: {col}"
+            actual_type = str(table.schema.types[col_idx[col]])
             assert expected_type in actual_type, (
                 f"Column '{col}': expected type containing '{expected_type}', got '{actual_type}'"
             )
 
     # Check not-null columns
     if not_null := schema.get("not_null"):
+        table_columns = table.columns
         for col in not_null:
-            null_count = table.column(col).null_count
+            null_count = table_columns[col_idx[col]].null_count
             assert null_count == 0, f"Column '{col}' has {null_count} null values"
 
     # Check unique constraint (composite key support)
@@ -68,14 +71,12 @@ def validate(table: pa.Table, schema: dict) -> None:
             unique = [unique]
 
         if len(unique) == 1:
-            values = table.column(unique[0]).to_pylist()
-            duplicates = len(values) - len(set(values))
+            # mode="all" counts null as one value, matching set() semantics
+            distinct = pc.count_distinct(table.column(unique[0]), mode="all").as_py()
+            duplicates = len(table) - distinct
             assert duplicates == 0, f"Column '{unique[0]}' has {duplicates} duplicate values"
         else:
-            # Composite key
-            rows = [
-                tuple(table.column(col).to_pylist()[i] for col in unique)
-                for i in range(len(table))
-            ]
-            duplicates = len(rows) - len(set(rows))
+            # Composite key - count distinct combinations with an Arrow hash group-by
+            distinct = len(table.select(unique).group_by(unique).aggregate([]))
+            duplicates = len(table) - distinct
             assert duplicates == 0, f"Columns {unique} have {duplicates} duplicate combinations"